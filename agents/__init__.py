@@ -0,0 +1,263 @@
+"""
+Agent 创建和配置模块
+
+提供预配置的 Agent 实例，使用基于文件系统的提示词生成工作流。
+"""
+
+import os
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from deepagents import create_deep_agent
+from deepagents.backends import CompositeBackend, FilesystemBackend, StateBackend, StoreBackend
+from dotenv import load_dotenv
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+from langchain_deepseek import ChatDeepSeek
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph.state import CompiledStateGraph
+from langgraph.store.memory import InMemoryStore
+
+from toolkits import FileBasedPromptToolkit
+
+# 加载环境变量
+load_dotenv()
+
+# 流式输出合并窗口：超过时间间隔（秒）或字符数阈值才真正写出
+_STREAM_FLUSH_INTERVAL = 0.05
+_STREAM_FLUSH_CHARS = 256
+
+# Agent 系统提示词（静态文本，模块加载时创建一次）
+_SYSTEM_PROMPT = """你是一个提示词生成专家助手，使用基于文件系统的状态机工作流。
+
+   ## 核心角色
+   提示词生成专家助手，使用基于文件系统的状态机工作流。
+
+   ## 工作目录
+   /memories/workspace/（持久化到磁盘）
+
+   ## 标准流程
+   1. 准备需求 → requirement.txt
+   2. 生成规格 → prompt_architect_file() → analysis.json
+   3. 生成测试 → data_generator_file() → test_data.json
+   4. 生成提示 → prompt_builder_file() → final_prompt.json
+
+   ## 交互原则
+   - 先交流理解需求，再执行
+   - 按步骤执行，展示中间结果
+   - 根据反馈灵活调整
+"""
+
+# 相对 work_dir 的解析根目录
+_PROJECT_ROOT = "/home/zhonghan.chen/code/promptx"
+
+# 工具包复用池：(real_work_dir, id(model)) -> FileBasedPromptToolkit
+# 池中的工具包持有 model 引用，因此 id(model) 在其存活期间不会被复用
+# 池容量有限，超出时淘汰最久未使用的工具包（同时释放其 model 引用）
+_TOOLKIT_POOL_SIZE = 16
+_TOOLKIT_POOL: OrderedDict[Tuple[str, int], FileBasedPromptToolkit] = OrderedDict()
+
+# 长期记忆存储：同一工作目录的 Agent 共享一个 store
+_STORE_CACHE: Dict[str, InMemoryStore] = {}
+
+
+def print_stream(stream: Iterator[Tuple[str, Any]]) -> None:
+    """
+    美化流式输出，区分工具调用和智能体响应
+
+    Args:
+        stream: agent.stream() 返回的迭代器
+    """
+    import sys
+
+    # 热循环中使用的绑定方法缓存为局部变量，避免每个 chunk 重复查找属性
+    out_write = sys.stdout.write
+    out_flush = sys.stdout.flush
+    err_write = sys.stderr.write
+    monotonic = time.monotonic
+
+    # 合并逐 token 的输出，减少 write/flush 次数。
+    # 时间窗口只在新 chunk 到达时检查：窗口内收到的文本会缓冲到下一个 chunk、
+    # 工具调用或流结束时才写出，因此模型停顿期间可能有少量文本延迟显示。
+    buf = []
+    buf_len = 0
+    last_flush = monotonic()
+
+    def flush_output() -> None:
+        nonlocal buf_len, last_flush
+        if buf:
+            out_write("".join(buf))
+            out_flush()
+            buf.clear()
+            buf_len = 0
+        last_flush = monotonic()
+
+    try:
+        for mode, chunk in stream:
+            if mode == "messages":
+                msg, _ = chunk  # metadata 未使用，用 _ 忽略
+
+                # AI 消息（智能体思考过程）
+                if isinstance(msg, (AIMessage, AIMessageChunk)):
+                    # 有工具调用时（单次属性查找，纯文本 token 直接跳过）
+                    tool_calls = getattr(msg, "tool_calls", None)
+                    if tool_calls:
+                        for tool_call in tool_calls:
+                            # 只有当工具名不为空时才显示（过滤流式传输中的空块）
+                            tool_name = tool_call.get("name")
+                            if not tool_name:
+                                continue
+                            tool_name = tool_name.strip()  # 去除空白
+                            if not tool_name:
+                                continue
+
+                            tool_args = tool_call.get("args", {})
+                            flush_output()  # 保证已缓冲的回复先于工具信息输出
+                            err_write(f"\n🔧 调用工具: {tool_name}\n")
+                            if tool_args:
+                                # 格式化参数显示
+                                args_str = ", ".join(f"{k}={v}" for k, v in tool_args.items())
+                                err_write(f"   参数: {args_str}\n")
+
+                    # 有内容时（智能体的回复）
+                    content = getattr(msg, "content", "")
+                    if content:
+                        buf.append(content)
+                        buf_len += len(content)
+                        if buf_len > _STREAM_FLUSH_CHARS or monotonic() - last_flush > _STREAM_FLUSH_INTERVAL:
+                            flush_output()
+
+                # 工具输出消息
+                elif isinstance(msg, ToolMessage):
+                    tool_name = msg.name
+                    content = msg.content
+
+                    # 简化工具输出显示（格式化精度一次完成截断与拼接）
+                    preview = f"{content:.200s}..." if len(content) > 200 else content
+
+                    flush_output()
+                    err_write(f"\n✅ 工具完成: {tool_name}\n")
+                    if preview.strip():
+                        err_write(f"   输出: {preview}\n")
+
+            elif mode == "updates":
+                # 状态更新（可选：显示工作进度）
+                pass
+    finally:
+        # 异常或中断时也写出已缓冲的回复，避免丢失部分输出
+        flush_output()
+
+    err_write("\n\n")  # 结束换行
+
+
+@lru_cache(maxsize=None)
+def get_deepseek_model():
+    """获取 DeepSeek 模型实例（进程内共享同一个实例）"""
+    api_key = os.getenv("DEEP_SEEK_API_KEY")
+    return ChatDeepSeek(api_key=api_key, model="deepseek-chat")
+
+
+@lru_cache(maxsize=None)
+def _resolve_work_dir(work_dir: str) -> str:
+    """将 work_dir 解析为真实磁盘路径（相对路径基于项目根目录）"""
+    if work_dir.startswith("/"):
+        return work_dir
+    return f"{_PROJECT_ROOT}/{work_dir}"
+
+
+def _get_prompt_toolkit(model, real_work_dir: str) -> FileBasedPromptToolkit:
+    """获取（必要时创建）与 model 和工作目录绑定的文件版工具包"""
+    key = (real_work_dir, id(model))
+    toolkit = _TOOLKIT_POOL.get(key)
+    if toolkit is None:
+        toolkit = _TOOLKIT_POOL[key] = FileBasedPromptToolkit(model=model, work_dir=real_work_dir)
+        if len(_TOOLKIT_POOL) > _TOOLKIT_POOL_SIZE:
+            _TOOLKIT_POOL.popitem(last=False)
+    else:
+        _TOOLKIT_POOL.move_to_end(key)
+    return toolkit
+
+
+def _get_store(real_work_dir: str) -> InMemoryStore:
+    """获取（必要时创建）工作目录对应的共享 store"""
+    store = _STORE_CACHE.get(real_work_dir)
+    if store is None:
+        store = _STORE_CACHE[real_work_dir] = InMemoryStore()
+    return store
+
+
+def reset_store(work_dir: str = "memories") -> None:
+    """丢弃工作目录对应的共享 store，下次创建 Agent 时重新初始化"""
+    _STORE_CACHE.pop(_resolve_work_dir(work_dir), None)
+
+
+def create_file_based_prompt_agent(
+    model=None,
+    work_dir: str = "memories",
+    checkpointer: Optional[BaseCheckpointSaver] = None,
+    enable_checkpointer: bool = True,
+) -> CompiledStateGraph:
+    """
+    创建基于文件系统的提示词生成 Agent
+
+    使用文件 I/O 版本的 prompt 工具包，支持：
+    - 中间结果可查看、可编辑
+    - 工作流可中断恢复
+    - 人工介入调整
+    - 对话历史记忆（通过 checkpointer）
+
+    路径系统：
+    - Agent 内部：使用相对路径（如 "requirement.txt"）
+    - 文件系统后端：/memories/workspace/ -> {work_dir}/workspace/（磁盘持久化）
+    - 临时空间：/（内存，会话结束丢失）
+
+    Args:
+        model: LangChain 模型，默认使用 DeepSeek
+        work_dir: 磁盘持久化根目录（例如 "/home/user/code/promptx/memories"）
+        checkpointer: 自定义 checkpointer，默认 None 使用 MemorySaver。
+                      其生命周期（如数据库连接）由调用方管理，例如使用 SQLite 增量持久化
+                      （需安装可选依赖 langgraph-checkpoint-sqlite）：
+
+                          with SqliteSaver.from_conn_string("checkpoints.db") as saver:
+                              agent = create_file_based_prompt_agent(checkpointer=saver)
+        enable_checkpointer: 是否启用对话历史记忆，关闭后每次调用互相独立
+
+    Returns:
+        配置好的 deep agent
+    """
+    if model is None:
+        model = get_deepseek_model()
+
+    # 构建真实磁盘路径
+    real_work_dir = _resolve_work_dir(work_dir)
+
+    prompt_toolkit = _get_prompt_toolkit(model, real_work_dir)
+
+    # 创建 checkpointer 实现对话记忆
+    if not enable_checkpointer:
+        checkpointer = None
+    elif checkpointer is None:
+        checkpointer = MemorySaver()
+
+    agent = create_deep_agent(
+        name="file-prompt-agent",
+        model=model,
+        tools=prompt_toolkit.get_tools(),
+        store=_get_store(real_work_dir),
+        backend=lambda rt: CompositeBackend(
+            default=StateBackend(rt),
+            routes={
+                "/memories/": FilesystemBackend(
+                    root_dir=real_work_dir,
+                    virtual_mode=True,  # 启用虚拟模式，安全限制在目录内
+                ),
+            },
+        ),
+        checkpointer=checkpointer,  # 启用对话历史记忆
+        system_prompt=_SYSTEM_PROMPT,
+    )
+
+    return agent
+
@@ -0,0 +1,69 @@
+"""
+交互式命令行入口
+
+运行方式：python -m agents
+"""
+
+import os
+
+from prompt_toolkit import PromptSession
+
+from agents import create_file_based_prompt_agent, get_deepseek_model, print_stream
+
+
+def main() -> None:
+    deepseek = get_deepseek_model()
+    agent = create_file_based_prompt_agent(model=deepseek)
+
+    # 创建 prompt_toolkit 会话
+    session = PromptSession("💬 你: ")
+
+    # 仅在配置了 Langfuse 时才导入并启用追踪回调
+    callbacks = []
+    if os.getenv("LANGFUSE_PUBLIC_KEY") and os.getenv("LANGFUSE_SECRET_KEY"):
+        from langfuse.langchain import CallbackHandler
+
+        callbacks.append(CallbackHandler())
+
+    print("🤖 提示词生成助手已启动！输入 'exit' 或 'quit' 退出\n")
+
+    # 交互式对话循环
+    while True:
+        try:
+            # 获取用户输入（使用 prompt_toolkit，支持中文正确删除）
+            user_input = session.prompt().strip()
+
+            # 检查退出命令
+            if user_input.lower() in ["exit", "quit", "退出"]:
+                print("👋 再见！")
+                break
+
+            # 跳过空输入
+            if not user_input:
+                continue
+
+            # 执行 agent 流式输出
+            print("\n🤖 助手: ", end="", flush=True)
+            stream = agent.stream(
+                input={"messages": [{"role": "user", "content": user_input}]},
+                config={"callbacks": callbacks, "configurable": {"thread_id": "test_session"}},
+                stream_mode=["messages"],
+            )
+
+            # 使用美化打印函数
+            print_stream(stream)
+
+        except KeyboardInterrupt:
+            print("\n\n👋 再见！")
+            break
+        except EOFError:
+            # Ctrl+D 退出
+            print("\n\n👋 再见！")
+            break
+        except Exception as e:
+            print(f"\n❌ 发生错误: {e}")
+            continue
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,41 @@ PromptX 工具包模块
 提供可复用的 LangChain 工具集合，用于构建 AI Agent。
 """
 
-from .web import WebToolkit
-from .common import CommonToolkit
-from .prompt import PromptToolkit, FileBasedPromptToolkit
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .common import CommonToolkit
+    from .prompt import FileBasedPromptToolkit, PromptToolkit, WorkspaceFileNotFound
+    from .web import WebToolkit
+
+# 按需导入子模块（PEP 562），避免 `from toolkits import WebToolkit` 连带加载其他工具包
+_LAZY_EXPORTS = {
+    "WebToolkit": ".web",
+    "CommonToolkit": ".common",
+    "PromptToolkit": ".prompt",
+    "FileBasedPromptToolkit": ".prompt",
+    "WorkspaceFileNotFound": ".prompt",
+}
 
 __all__ = [
     "WebToolkit",
     "CommonToolkit",
     "PromptToolkit",
     "FileBasedPromptToolkit",
+    "WorkspaceFileNotFound",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
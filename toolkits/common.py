@@ -17,6 +17,8 @@ def _now_tool() -> str:
 class CommonToolkit:
     """通用工具包"""
 
+    __slots__ = ()
+
     def get_tools(self) -> List:
         """返回工具列表"""
         return [tool(_now_tool)]
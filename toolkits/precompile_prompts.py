@@ -0,0 +1,74 @@
+"""
+Meta prompt 预编译
+
+将 meta_prompts/*.yaml 预解析为 meta_prompts/_compiled.json，运行时直接加载 JSON，
+跳过 YAML 解析。修改 YAML 模板后需重新运行：
+
+    python -m toolkits.precompile_prompts [meta_prompts_dir]
+"""
+
+import hashlib
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+COMPILED_FILENAME = "_compiled.json"
+
+# {{variable}} 格式的占位符
+PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+
+def source_hash(source: bytes) -> str:
+    """计算 YAML 源文件内容的哈希，用于判断预编译结果是否过期"""
+    return hashlib.sha256(source).hexdigest()
+
+
+def parse_prompt_yaml(source: bytes) -> Dict[str, Any]:
+    """
+    解析 YAML 模板，并为每条消息记录其引用的变量名
+
+    Args:
+        source: YAML 模板文件内容
+
+    Returns:
+        模板字典，每条消息附带 variables 列表（无占位符时为空）
+    """
+    # 延迟导入：仅在需要解析 YAML 时付出 yaml 的导入开销
+    import yaml
+
+    # 优先使用 libyaml 的 C 实现，不可用时回退到纯 Python 版本
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    template = yaml.load(source, Loader=loader)
+
+    for msg in template["messages"]:
+        msg["variables"] = sorted(set(PLACEHOLDER_RE.findall(msg["content"])))
+    return template
+
+
+def compile_prompts(meta_prompts_dir: Path) -> Path:
+    """
+    将目录下所有 YAML 模板编译为单个 JSON 文件
+
+    Args:
+        meta_prompts_dir: meta prompts YAML 模板目录路径
+
+    Returns:
+        生成的 JSON 文件路径
+    """
+    import orjson
+
+    compiled = {}
+    for yaml_path in sorted(meta_prompts_dir.glob("*.yaml")):
+        source = yaml_path.read_bytes()
+        # 记录源文件哈希，加载时据此判断 YAML 是否在编译后被修改
+        compiled[yaml_path.stem] = {"sha256": source_hash(source), "template": parse_prompt_yaml(source)}
+    output_path = meta_prompts_dir / COMPILED_FILENAME
+    output_path.write_bytes(orjson.dumps(compiled, option=orjson.OPT_INDENT_2) + b"\n")
+    return output_path
+
+
+if __name__ == "__main__":
+    meta_prompts_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("meta_prompts")
+    output_path = compile_prompts(meta_prompts_dir)
+    print(f"✅ 已生成: {output_path}")
@@ -4,13 +4,56 @@ Prompt 工具包
 提供提示词工程工作流工具，支持内存版本和文件 I/O 版本。
 """
 
+import re
+from functools import lru_cache
+from types import MappingProxyType
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import IO, Any, Dict, List, Optional, Tuple
 
-import yaml
+import orjson
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.tools import StructuredTool
 
+from .precompile_prompts import COMPILED_FILENAME, PLACEHOLDER_RE, parse_prompt_yaml, source_hash
+
+
+class WorkspaceFileNotFound(FileNotFoundError):
+    """工作目录中找不到指定文件"""
+
+    def __init__(self, file_path: str):
+        super().__init__(f"找不到文件 {file_path}")
+        self.file_path = file_path
+
+
+def _freeze(obj: Any) -> Any:
+    """将字典递归转换为只读映射、列表转换为元组，防止调用方修改缓存的模板"""
+    if isinstance(obj, dict):
+        return MappingProxyType({key: _freeze(value) for key, value in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(item) for item in obj)
+    return obj
+
+
+@lru_cache(maxsize=None)
+def _load_compiled_templates(meta_prompts_dir: str) -> Dict[str, Any]:
+    """加载预编译的模板文件；文件不存在时返回空字典"""
+    compiled_path = Path(meta_prompts_dir) / COMPILED_FILENAME
+    try:
+        return orjson.loads(compiled_path.read_bytes())
+    except FileNotFoundError:
+        return {}
+
+
+@lru_cache(maxsize=None)
+def _load_prompt_template_cached(meta_prompts_dir: str, name: str) -> Dict[str, Any]:
+    """加载并缓存 prompt 模板（每个进程只加载一次）"""
+    source = (Path(meta_prompts_dir) / f"{name}.yaml").read_bytes()
+    entry = _load_compiled_templates(meta_prompts_dir).get(name)
+    # 优先使用预编译结果；YAML 内容与编译时不一致（忘记重新编译）时回退到解析 YAML
+    if entry is not None and entry["sha256"] == source_hash(source):
+        return _freeze(entry["template"])
+    return _freeze(parse_prompt_yaml(source))
+
 
 class PromptToolkit:
     """
@@ -19,6 +62,8 @@ class PromptToolkit:
     通过大字符串传递数据的原始版本。
     """
 
+    __slots__ = ("model", "meta_prompts_dir")
+
     def __init__(self, model=None, meta_prompts_dir: Optional[Path] = None):
         """
         初始化 Prompt 工具包
@@ -31,21 +76,25 @@ class PromptToolkit:
         self.meta_prompts_dir = meta_prompts_dir or Path("meta_prompts")
 
     def _load_prompt_template(self, name: str) -> Dict[str, Any]:
-        """加载 YAML 格式的 prompt 模板"""
-        yaml_path = self.meta_prompts_dir / f"{name}.yaml"
-        with open(yaml_path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+        """加载 YAML 格式的 prompt 模板（结果在进程内缓存，只读）"""
+        return _load_prompt_template_cached(str(self.meta_prompts_dir), name)
 
     def _render_messages(self, template: Dict, **kwargs) -> List[Dict[str, str]]:
         """渲染消息模板，替换变量占位符"""
-        messages = []
-        for msg in template["messages"]:
-            content = msg["content"]
-            # 替换 {{variable}} 格式的占位符
-            for key, value in kwargs.items():
-                content = content.replace(f"{{{{{key}}}}}", str(value))
-            messages.append({"role": msg["role"], "content": content})
-        return messages
+        values = {key: str(value) for key, value in kwargs.items()}
+
+        def _substitute(match: re.Match) -> str:
+            # 未提供的变量保留原始占位符
+            return values.get(match.group(1), match.group(0))
+
+        # 单次扫描替换所有占位符，与变量数量无关；无占位符的消息直接复用原文
+        return [
+            {
+                "role": msg["role"],
+                "content": PLACEHOLDER_RE.sub(_substitute, msg["content"]) if msg["variables"] else msg["content"],
+            }
+            for msg in template["messages"]
+        ]
 
     def _call_llm(self, messages: List[Dict[str, str]]) -> str:
         """调用 LLM 并返回响应"""
@@ -207,6 +256,8 @@ class FileBasedPromptToolkit(PromptToolkit):
     - 所有文件操作相对于工作目录 /memories/workspace/
     """
 
+    __slots__ = ("work_dir", "_tools")
+
     def __init__(self, model, work_dir: str, **kwargs):
         """
         初始化文件版 Prompt 工具包
@@ -219,24 +270,39 @@ class FileBasedPromptToolkit(PromptToolkit):
             **kwargs: 传递给父类的其他参数
         """
         super().__init__(model, **kwargs)
-        # 真实磁盘路径
+        # 真实磁盘路径（目录在首次写入失败时才创建）
         self.work_dir = Path(work_dir) / "workspace"
+        # 工具对象只包装绑定方法，首次 get_tools() 时创建后复用
+        self._tools: Optional[Tuple[StructuredTool, ...]] = None
 
     def _read_file(self, file_path: str) -> str:
-        """读取文件内容"""
-        path = self.work_dir / Path(file_path)
-        if not path.exists():
-            return f"Error: File '{file_path}' not found"
-        with open(path, "r", encoding="utf-8") as f:
-            return f.read()
+        """读取文件内容，文件不存在时抛出 WorkspaceFileNotFound"""
+        path = self.work_dir.joinpath(file_path)
+        try:
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            raise WorkspaceFileNotFound(file_path) from None
+
+    def _open_for_write(self, file_path: str, mode: str, **kwargs) -> IO:
+        """打开待写入的文件；父目录不存在时创建后重试一次"""
+        path = self.work_dir.joinpath(file_path)
+        try:
+            return open(path, mode, **kwargs)
+        except FileNotFoundError:
+            # 仅在目录缺失时才 mkdir，正常写入不产生额外的系统调用
+            path.parent.mkdir(parents=True, exist_ok=True)
+            return open(path, mode, **kwargs)
 
     def _write_file(self, file_path: str, content: str) -> None:
         """写入文件内容"""
-        path = self.work_dir / Path(file_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
+        with self._open_for_write(file_path, "w", encoding="utf-8") as f:
             f.write(content)
 
+    def _write_json(self, file_path: str, obj: Any) -> None:
+        """将对象序列化为 JSON（缩进 2 格）并写入文件"""
+        with self._open_for_write(file_path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+
     def _prompt_architect_file_impl(self) -> str:
         """
         [文件版] 将用户需求转换为技术规格文档。
@@ -254,8 +320,9 @@ class FileBasedPromptToolkit(PromptToolkit):
         output_path = "analysis.json"
 
         # 读取需求
-        requirement = self._read_file(requirement_path)
-        if requirement.startswith("Error:"):
+        try:
+            requirement = self._read_file(requirement_path)
+        except WorkspaceFileNotFound:
             return f"❌ 错误：找不到需求文件 {requirement_path}"
 
         # 调用 LLM 生成
@@ -292,8 +359,9 @@ class FileBasedPromptToolkit(PromptToolkit):
         output_path = "test_data.json"
 
         # 读取分析
-        analysis = self._read_file(analysis_path)
-        if analysis.startswith("Error:"):
+        try:
+            analysis = self._read_file(analysis_path)
+        except WorkspaceFileNotFound:
             return f"❌ 错误：找不到技术规格文件 {analysis_path}"
 
         # 调用 LLM 生成
@@ -330,12 +398,14 @@ class FileBasedPromptToolkit(PromptToolkit):
         output_path = "final_prompt.json"
 
         # 读取文件
-        analysis = self._read_file(analysis_path)
-        if analysis.startswith("Error:"):
+        try:
+            analysis = self._read_file(analysis_path)
+        except WorkspaceFileNotFound:
             return f"❌ 错误：找不到技术规格文件 {analysis_path}"
 
-        test_data = self._read_file(test_data_path)
-        if test_data.startswith("Error:"):
+        try:
+            test_data = self._read_file(test_data_path)
+        except WorkspaceFileNotFound:
             return f"❌ 错误：找不到测试数据文件 {test_data_path}"
 
         # 调用 LLM 生成
@@ -349,7 +419,13 @@ class FileBasedPromptToolkit(PromptToolkit):
 
     def get_tools(self) -> List:
         """返回工具列表（文件版本）"""
-        return [
+        if self._tools is None:
+            self._tools = self._build_tools()
+        return list(self._tools)
+
+    def _build_tools(self) -> Tuple[StructuredTool, ...]:
+        """创建文件版工具对象"""
+        return (
             StructuredTool.from_function(
                 func=self._prompt_architect_file_impl,
                 name="prompt_architect_file",
@@ -390,4 +466,4 @@ class FileBasedPromptToolkit(PromptToolkit):
 使用场景：完成测试数据后，最后一步调用此工具。
 """,
             ),
-        ]
+        )
@@ -4,15 +4,38 @@ Web 搜索工具包
 提供互联网搜索和网页读取功能。
 """
 
-from typing import List
+from __future__ import annotations
 
-import requests
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import orjson
 from langchain_core.tools import StructuredTool
 
+if TYPE_CHECKING:
+    import httpx
+    import requests
+
+# 单条搜索结果的格式（易于 AI 阅读）
+_SEARCH_RESULT_FORMAT = "标题: {}\n链接: {}\n摘要: {}\n---"
+
+# 搜索响应体大小上限（字节）。正常的 SearXNG 响应（即使数百条结果）远小于此值，
+# 该上限仅用于拦截异常服务端返回的超大响应，避免无界的下载与解析
+_MAX_SEARCH_RESPONSE_BYTES = 4 * 1024 * 1024
+_SEARCH_CHUNK_SIZE = 8192
+
+
+def _append_capped(body: bytearray, chunk: bytes) -> None:
+    """追加响应分块，超过搜索响应大小上限时抛出 ValueError"""
+    body += chunk
+    if len(body) > _MAX_SEARCH_RESPONSE_BYTES:
+        raise ValueError(f"响应超过 {_MAX_SEARCH_RESPONSE_BYTES} 字节上限")
+
 
 class WebToolkit:
     """Web 搜索和网页读取工具包"""
 
+    __slots__ = ("searx_url", "crawl4ai_url", "_session")
+
     def __init__(
         self,
         searx_url: str = "https://sousuo.emoe.top/search",
@@ -28,6 +51,80 @@ class WebToolkit:
         self.searx_url = searx_url
         self.crawl4ai_url = crawl4ai_url
 
+        # HTTP 会话在首次使用时创建（同时延迟 requests 的导入）
+        self._session: Optional[requests.Session] = None
+
+    def _get_session(self) -> requests.Session:
+        """获取（必要时创建）共享的同步 HTTP 会话"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            # 复用 keep-alive 连接，避免每次调用都重新握手
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=16,
+                max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+            )
+            self._session = requests.Session()
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+        return self._session
+
+    @staticmethod
+    def _new_aclient() -> httpx.AsyncClient:
+        """
+        创建异步 HTTP 客户端，调用方需通过 `async with` 使用并在当前事件循环内关闭。
+
+        连接绑定在创建它的事件循环上，跨 asyncio.run() 缓存会导致连接失效且无法关闭，
+        因此每次异步调用使用独立的客户端。
+        """
+        import httpx
+
+        return httpx.AsyncClient(transport=httpx.AsyncHTTPTransport(retries=2))
+
+    @staticmethod
+    def _build_search_params(query: str, categories: str, language: str, engine: str | None) -> Dict[str, Any]:
+        """构造 SearXNG 查询参数"""
+        params = {
+            "q": query,
+            "format": "json",
+            "categories": categories,
+            "language": language,
+        }
+        if engine:
+            params["engine"] = engine
+        return params
+
+    @staticmethod
+    def _format_search_results(raw_results: List[Dict[str, Any]], max_results: int) -> str:
+        """将原始搜索结果清洗为易于 AI 阅读的文本"""
+        # --- 核心优化：数据清洗 ---
+        # 只取前 max_results 条，避免 Token 溢出；仅提取 AI 需要的关键信息
+        return (
+            "\n".join(
+                _SEARCH_RESULT_FORMAT.format(
+                    res.get("title", "无标题"),
+                    res.get("url", "无链接"),
+                    res.get("content", "无描述"),
+                )
+                for res in raw_results[:max_results]
+            )
+            or "未找到相关结果。"
+        )
+
+    @staticmethod
+    def _format_reader_result(data: Dict[str, Any]) -> str:
+        """从 Crawl4AI 响应中提取正文，过长时截断"""
+        if data.get("success") and data.get("markdown"):
+            content = data.get("markdown", "")
+            if len(content) > 5000:
+                return content[:5000] + "\n\n(内容过长，已自动截断...)"
+            return content
+        else:
+            return f"未能提取内容: {data.get('error', '未知错误')}"
+
     def _web_search_impl(
         self,
         query: str,
@@ -49,46 +146,47 @@ class WebToolkit:
         Returns:
             str: 格式化的搜索结果列表，每条包含标题、来源链接和内容摘要。
         """
-        params = (
-            {
-                "q": query,
-                "format": "json",
-                "engine": engine,
-                "categories": categories,
-                "language": language,
-            }
-            if engine
-            else {
-                "q": query,
-                "format": "json",
-                "categories": categories,
-                "language": language,
-            }
-        )
+        params = self._build_search_params(query, categories, language, engine)
 
         try:
-            response = requests.get(self.searx_url, params=params, timeout=15)
-            response.raise_for_status()
-            raw_results = response.json().get("results", [])
+            # 流式读取并限制响应体大小，超限时立即中止下载
+            with self._get_session().get(self.searx_url, params=params, timeout=15, stream=True) as response:
+                response.raise_for_status()
+                body = bytearray()
+                for chunk in response.iter_content(chunk_size=_SEARCH_CHUNK_SIZE):
+                    _append_capped(body, chunk)
+            raw_results = orjson.loads(body).get("results", [])
         except Exception as e:
             return f"搜索失败: {str(e)}"
 
-        # --- 核心优化：数据清洗 ---
-        processed_results = []
-        # 只取前 max_results 条，避免 Token 溢出
-        for res in raw_results[:max_results]:
-            # 提取 AI 需要的关键信息
-            title = res.get("title", "无标题")
-            link = res.get("url", "无链接")
-            snippet = res.get("content", "无描述")
+        return self._format_search_results(raw_results, max_results)
 
-            # 格式化为易于 AI 阅读的字符串
-            processed_results.append(f"标题: {title}\n链接: {link}\n摘要: {snippet}\n---")
+    async def _web_search_async_impl(
+        self,
+        query: str,
+        max_results: int = 5,
+        categories: str = "general",
+        language: str = "zh-CN",
+        engine: str | None = None,
+    ) -> str:
+        """web_search 的异步版本，供 Agent 并发调用"""
+        params = self._build_search_params(query, categories, language, engine)
 
-        if not processed_results:
-            return "未找到相关结果。"
+        try:
+            # 流式读取并限制响应体大小，超限时立即中止下载
+            async with (
+                self._new_aclient() as client,
+                client.stream("GET", self.searx_url, params=params, timeout=15) as response,
+            ):
+                response.raise_for_status()
+                body = bytearray()
+                async for chunk in response.aiter_bytes(_SEARCH_CHUNK_SIZE):
+                    _append_capped(body, chunk)
+            raw_results = orjson.loads(body).get("results", [])
+        except Exception as e:
+            return f"搜索失败: {str(e)}"
 
-        return "\n".join(processed_results)
+        return self._format_search_results(raw_results, max_results)
 
     def _web_reader_impl(self, url: str) -> str:
         """
@@ -104,28 +202,38 @@ class WebToolkit:
         payload = {"url": url, "f": "fit"}
 
         try:
-            response = requests.post(self.crawl4ai_url, json=payload, timeout=30)
+            response = self._get_session().post(self.crawl4ai_url, json=payload, timeout=30)
             response.raise_for_status()
 
-            data = response.json()
+            # orjson 直接解析字节，省去 bytes -> str 解码
+            data = orjson.loads(response.content)
+        except Exception as e:
+            return f"读取网页失败: {str(e)}"
+
+        return self._format_reader_result(data)
 
-            if data.get("success") and data.get("markdown"):
-                content = data.get("markdown", "")
-                if len(content) > 5000:
-                    return content[:5000] + "\n\n(内容过长，已自动截断...)"
-                return content
-            else:
-                return f"未能提取内容: {data.get('error', '未知错误')}"
+    async def _web_reader_async_impl(self, url: str) -> str:
+        """web_reader 的异步版本，供 Agent 并发调用"""
+        payload = {"url": url, "f": "fit"}
 
+        try:
+            async with self._new_aclient() as client:
+                response = await client.post(self.crawl4ai_url, json=payload, timeout=30)
+            response.raise_for_status()
+            # orjson 直接解析字节，省去 bytes -> str 解码
+            data = orjson.loads(response.content)
         except Exception as e:
             return f"读取网页失败: {str(e)}"
 
+        return self._format_reader_result(data)
+
     def get_tools(self) -> List:
         """返回工具列表"""
 
         # 创建 web_search 工具
         web_search = StructuredTool.from_function(
             func=self._web_search_impl,
+            coroutine=self._web_search_async_impl,
             name="web_search",
             description="""利用 SearXNG 引擎进行互联网搜索。适用于获取实时新闻、技术文档或百科知识。
 
@@ -144,6 +252,7 @@ class WebToolkit:
         # 创建 web_reader 工具
         web_reader = StructuredTool.from_function(
             func=self._web_reader_impl,
+            coroutine=self._web_reader_async_impl,
             name="web_reader",
             description="""当你需要阅读特定网页的详细内容时使用此工具。
         支持动态加载的网页（如单页应用）。